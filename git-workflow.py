@@ -3,12 +3,28 @@
 # dependencies = []
 # ///
 
+import logging
 import os
 import subprocess
-from datetime import datetime
-from typing import List, NamedTuple, Tuple
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import AnyStr, Dict, List, Tuple
 
-class FileChange(NamedTuple):
+logger = logging.getLogger(__name__)
+
+# Size of the reads used to stream blob contents from git
+READ_CHUNK_SIZE = 64 * 1024
+
+# Every git command here only reads, so skip optional locks such as the index.lock
+# `git status` takes to write back its refreshed stat cache, and never prompt
+GIT_ENV = {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
+
+# Header row of the markdown table of changes
+MARKDOWN_HEADERS = ("File", "Status", "Added", "Removed", "% Changed", "Description")
+
+@dataclass(slots=True, frozen=True)
+class FileChange:
     file: str
     status: str
     added_lines: int
@@ -16,57 +32,134 @@ class FileChange(NamedTuple):
     percent_changed: float
     description: str = ""
 
-def run_git_command(args: List[str], cwd: str) -> Tuple[str, str, int]:
-    """Run a git command and return stdout, stderr, and return code."""
-    print(f"Running git command: {' '.join(args)}")
-    process = subprocess.Popen(
+def spawn_git(args: List[str], cwd: str, text: bool = True) -> subprocess.Popen:
+    """Start a git command without waiting for it to finish.
+
+    Pass `text=False` to get raw bytes back and skip decoding output that is only parsed.
+    """
+    logger.debug("git %s", " ".join(args))
+    return subprocess.Popen(
         ["git"] + args,
+        stdin=subprocess.DEVNULL,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         cwd=cwd,
-        text=True
+        env=GIT_ENV,
+        text=text
     )
+
+def finish_git(process: subprocess.Popen[AnyStr]) -> Tuple[AnyStr, AnyStr, int]:
+    """Wait for a git command started by `spawn_git` and return stdout, stderr, and return code.
+
+    Output is str, or bytes for a command started with `text=False`. Stdout is returned
+    unstripped, since leading spaces are significant in porcelain output.
+    """
     stdout, stderr = process.communicate()
-    return stdout.strip(), stderr.strip(), process.returncode
+    return stdout, stderr.strip(), process.returncode
+
+def get_head_line_counts(files: List[str], cwd: str) -> Dict[str, int]:
+    """Count the lines of each file as of HEAD using a single `git cat-file --batch` process."""
+    if not files:
+        return {}
+
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch=%(objectname) %(objectsize)"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        cwd=cwd,
+        env=GIT_ENV
+    )
+
+    # Feed all requests from a separate thread so a full stdout pipe cannot deadlock us
+    def write_requests():
+        process.stdin.write("".join(f"HEAD:{file}\n" for file in files).encode())
+        process.stdin.close()
+
+    writer = threading.Thread(target=write_requests)
+    writer.start()
+
+    line_counts = {}
+    for file in files:
+        # Header is "<sha> <size>\n", or "HEAD:<file> missing\n"
+        header = process.stdout.readline()
+        if header.endswith(b" missing\n"):
+            line_counts[file] = 0
+            continue
+        _, size = header.split()
+
+        # Count newlines chunk by chunk rather than holding the whole blob in memory
+        remaining = int(size)
+        line_count = 0
+        chunk = b""
+        while remaining:
+            chunk = process.stdout.read(min(remaining, READ_CHUNK_SIZE))
+            if not chunk:
+                break
+            line_count += chunk.count(b"\n")
+            remaining -= len(chunk)
+        # A final line without a trailing newline still counts
+        if chunk and not chunk.endswith(b"\n"):
+            line_count += 1
+        line_counts[file] = line_count
+
+        # Contents are followed by a single LF
+        process.stdout.read(1)
+
+    writer.join()
+    process.wait()
+    return line_counts
 
 def get_file_changes(repo_path: str) -> List[FileChange]:
     """Get list of changed files with detailed statistics."""
     changes = []
     stats_dict = {}
+    binary_files = set()
 
-    # Get diff stats for all modified, unstaged files at once
-    diff_stats, _, _ = run_git_command(["diff", "--numstat"], repo_path)
-    for line in diff_stats.split('\n'):
-        if line:
-            added, removed, file = line.split('\t')
-            stats_dict[file] = (int(added), int(removed))
-
-    # Get diff stats for all modified, staged files at once
-    diff_stats, _, _ = run_git_command(["diff", "--numstat", "--cached"], repo_path)
-    for line in diff_stats.split('\n'):
-        if line:
-            added, removed, file = line.split('\t')
-            if file in stats_dict:
-                stats_dict[file] = (
-                    stats_dict[file][0] + int(added),
-                    stats_dict[file][1] + int(removed)
-                )
-            else:
-                stats_dict[file] = (int(added), int(removed))
+    # The two queries are independent, so start them both before waiting on either
+    # Numstat output is parsed as bytes (int() accepts them); only file names are decoded
+    # With -z, paths are NUL-terminated and never quoted
+    numstat_process = spawn_git(["diff", "--numstat", "-z", "HEAD"], repo_path, text=False)
+    # Untracked directories stay collapsed even if status.showUntrackedFiles=all is set
+    status_process = spawn_git(
+        ["status", "--porcelain", "-z", "--untracked-files=normal"], repo_path
+    )
+
+    # Get diff stats for all staged and unstaged changes against HEAD at once
+    diff_stats, _, return_code = finish_git(numstat_process)
+    if return_code != 0:
+        # HEAD does not resolve until the first commit, so everything is in the index
+        diff_stats, _, _ = finish_git(
+            spawn_git(["diff", "--numstat", "-z", "--cached"], repo_path, text=False)
+        )
+    records = iter(diff_stats.split(b'\0'))
+    for record in records:
+        if record:
+            added, removed, file = record.split(b'\t', 2)
+            if not file:  # A rename's old and new paths follow as separate records
+                next(records)
+                file = next(records)
+            if added == b'-':  # Binary files have no line counts
+                binary_files.add(file.decode())
+                continue
+            stats_dict[file.decode()] = (int(added), int(removed))
 
     # Get status of files
-    stdout, stderr, return_code = run_git_command(["status", "--porcelain"], repo_path)
+    stdout, stderr, return_code = finish_git(status_process)
     if return_code != 0:
         print(f"Error getting file status: {stderr}")
         return changes
 
-    for line in stdout.split('\n'):
-        if not line:
+    # Collect status entries first so HEAD line counts can be fetched in one batch
+    entries = []
+    records = iter(stdout.split('\0'))
+    for record in records:
+        if not record:
             continue
+        # Records are "XY <path>"; a rename or copy is followed by a record with its old path
+        status, file = record[:2], record[3:]
+        if 'R' in status or 'C' in status:
+            next(records)
 
-        status = line[:2]
-        file = line[2:].strip()
-        
         # Skip .git directory and pending-changes.md
         if file.startswith('.git/') or file == 'pending-changes.md':
             continue
@@ -76,7 +169,16 @@ def get_file_changes(repo_path: str) -> List[FileChange]:
             added, removed = stats_dict[file]
         else:
             added, removed = 0, 0
+        entries.append((status, file, added, removed))
+
+    # Only modified (not new, deleted or binary) files need their HEAD line count
+    head_line_counts = get_head_line_counts([
+        file for status, file, added, removed in entries
+        if 'D' not in status and 'A' not in status and (added > 0 or removed > 0)
+        and file not in binary_files
+    ], repo_path)
 
+    for status, file, added, removed in entries:
         # Calculate percentage changed
         total_lines = added + removed
         percent_changed = (total_lines / max(1, total_lines)) * 100
@@ -84,17 +186,15 @@ def get_file_changes(repo_path: str) -> List[FileChange]:
         # Get diff statistics
         if 'D' in status:  # For deleted files, count all lines as removed
             changes.append(FileChange(file, status, 0, removed, 100.0, "File deleted"))
+        elif file in binary_files:
+            changes.append(FileChange(file, status, 0, 0, 100.0, "Binary file"))
         else:
             if added > 0 or removed > 0:
                 # Get total lines in the file for percentage calculation
                 # Check both status characters - first char is staging status, second is working tree status
                 is_new_file = 'A' in status  # File is new if either staged or unstaged status is 'A'
                 if not is_new_file:
-                    file_content, _, _ = run_git_command(
-                        ["show", f"HEAD:{file}"],
-                        repo_path
-                    )
-                    total_lines = len(file_content.split('\n')) if file_content else 0
+                    total_lines = head_line_counts[file]
                     percent = round((added + removed) / total_lines * 100, 2) if total_lines > 0 else 100
                 else:
                     percent = 100  # New file
@@ -114,38 +214,96 @@ def format_markdown_table(changes: List[FileChange]) -> str:
     if not changes:
         return "No changes detected."
 
-    # Define column headers and widths
-    headers = ["File", "Status", "Added", "Removed", "% Changed", "Description"]
-    rows = [[
-        change.file,
-        change.status,
-        str(change.added_lines),
-        str(change.removed_lines),
-        f"{change.percent_changed:.1f}%",
-        change.description
-    ] for change in changes]
-    
-    # Calculate column widths
-    widths = [len(h) for h in headers]
-    for row in rows:
-        for i, cell in enumerate(row):
-            widths[i] = max(widths[i], len(cell))
-    
-    # Format table
-    sep = "|".join("-" * (w + 2) for w in widths)
-    header = "|".join(f" {h:<{w}} " for h, w in zip(headers, widths))
-    
-    table_rows = [
-        "|".join(f" {cell:<{w}} " for cell, w in zip(row, widths))
-        for row in rows
+    rows = [
+        (
+            change.file,
+            change.status,
+            str(change.added_lines),
+            str(change.removed_lines),
+            f"{change.percent_changed:.1f}%",
+            change.description,
+        )
+        for change in changes
     ]
-    
-    return f"""|{header}|
-|{sep}|
-""" + "\n".join(f"|{row}|" for row in table_rows)
+    # Column widths from one pass over each column
+    widths = [
+        max(len(h), max(map(len, column))) for h, column in zip(MARKDOWN_HEADERS, zip(*rows))
+    ]
+
+    # Format table from a row template built once for these widths
+    row_format = "| " + " | ".join("{:<%d}" % w for w in widths) + " |"
+    lines = [
+        row_format.format(*MARKDOWN_HEADERS),
+        "|" + "|".join("-" * (w + 2) for w in widths) + "|",
+    ]
+    lines.extend(row_format.format(*row) for row in rows)
+
+    return "\n".join(lines)
+
+# The quoted-path helpers and split_diff_by_file mirror src/git_helper/git_utils.py:
+# this script runs on its own with no dependencies, so it cannot import the package.
+# tests/test_git_workflow.py checks that both copies split diffs the same way.
+
+# Single-character escapes in the C-quoted paths git writes; other bytes are
+# written as a backslash and three octal digits
+_QUOTED_PATH_ESCAPES = dict(zip('abtnvfr"\\', '\a\b\t\n\v\f\r"\\'))
+
+def _read_quoted_path(text: str, start: int) -> Tuple[str, int]:
+    """Decode the C-quoted path opening at text[start]; also return the index past it."""
+    path = bytearray()
+    i = start + 1
+    while text[i] != '"':
+        if text[i] != "\\":
+            path += text[i].encode()
+            i += 1
+        elif text[i + 1] in "01234567":
+            # Non-ASCII paths are quoted byte by byte unless core.quotePath is off
+            path.append(int(text[i + 1 : i + 4], 8))
+            i += 4
+        else:
+            path += _QUOTED_PATH_ESCAPES[text[i + 1]].encode()
+            i += 2
+    return path.decode("utf-8", "replace"), i + 1
+
+def _diff_section_path(section: str) -> str:
+    """Get the new path of a `diff --git` section, whose header is "a/<old> b/<new>"."""
+    header = section.split("\n", 1)[0]
+    if not header.endswith('"'):
+        # Unless the file was renamed both paths are the same, which also holds when a
+        # path itself contains " b/"
+        file = header[len(header) // 2 + 3 :]
+        if header == f"a/{file} b/{file}":
+            return file
+    # A rename or copy names its new path unambiguously in the extended header
+    for marker in ("\nrename to ", "\ncopy to "):
+        start = section.find(marker)
+        if start != -1:
+            start += len(marker)
+            end = section.find("\n", start)
+            file = section[start : end if end != -1 else None]
+            return _read_quoted_path(file, 0)[0] if file.startswith('"') else file
+    if header.endswith('"'):
+        # git quotes paths with special characters
+        start = _read_quoted_path(header, 0)[1] + 1 if header.startswith('"') else 0
+        return _read_quoted_path(header, header.index('"b/', start))[0][2:]
+    return header.rsplit(" b/", 1)[-1]
+
+def split_diff_by_file(diff: str) -> Dict[str, str]:
+    """Split combined `git diff` output into per-file sections keyed by path."""
+    file_diffs = {}
+    for section in ("\n" + diff).split("\ndiff --git ")[1:]:
+        file_diffs[_diff_section_path(section)] = "diff --git " + section
+    return file_diffs
 
 def update_pending_changes(repo_path: str) -> None:
     """Update pending-changes.md with current changes."""
+    # Start the diff now so git produces it while the file changes are being computed.
+    # Without a pathspec it covers every changed file; sections are filtered below.
+    diff_process = spawn_git(["-c", "core.quotePath=false", "diff", "--no-color"], repo_path)
+    # Drain it from a separate thread so a large diff cannot fill the pipe and stall git
+    diff_result = []
+    diff_reader = threading.Thread(target=lambda: diff_result.extend(finish_git(diff_process)))
+    diff_reader.start()
     changes = get_file_changes(repo_path)
     
     # Group changes by directory to detect unrelated changes
@@ -167,15 +325,12 @@ def update_pending_changes(repo_path: str) -> None:
     
     # Generate pending-changes.md content
     if len(changes):
-        # Get git diff for all changed files
-        diff_output = ""
-        for change in changes:
-            diff_cmd = ["git", "diff", "--no-color", change.file]
-            result = subprocess.run(diff_cmd, capture_output=True, text=True)
-            if result.returncode == 0 and result.stdout:
-                diff_output += f"\n### {change.file}\n```diff\n{result.stdout}```\n"
+        # Git diff for all changed files, from the single call started above
+        diff_reader.join()
+        diff_stdout, _, return_code = diff_result
+        file_diffs = split_diff_by_file(diff_stdout.rstrip("\n")) if return_code == 0 else {}
 
-        content = f"""# Pending Changes ({datetime.now().strftime('%Y-%m-%d')})
+        header = f"""# Pending Changes ({date.today().isoformat()})
 
 ## Draft Commit Message
 
@@ -194,15 +349,25 @@ type: concise description of changes
 Please review the changes and stage the files you want to include in the commit. Once approved, the commit will be made and this file will be cleared.
 
 ## Detailed Changes
-{diff_output}
 """
-        
+
+        # Assemble pending-changes.md in one buffer so it is written with a single call
+        content = bytearray(header.encode())
+        for change in changes:
+            if change.file in file_diffs:
+                content.extend(b"\n### ")
+                content.extend(change.file.encode())
+                content.extend(b"\n```diff\n")
+                content.extend(file_diffs[change.file].encode())
+                content.extend(b"\n```\n")
+        content.extend(b"\n")
+
         # Write to pending-changes.md
         pending_changes_path = os.path.join(repo_path, "pending-changes.md")
-        with open(pending_changes_path, "w") as f:
+        with open(pending_changes_path, "wb") as f:
             f.write(content)
-            print(content)
     else:
+        diff_reader.join()
         print("No changes detected.")
     
 if __name__ == "__main__":
@@ -2,26 +2,25 @@
 
 import logging
 import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 import click
-from git.cmd import Git
 from rich.console import Console
-from rich.markdown import Markdown
 
 from git_helper.commit_validator import (
     format_validation_error,
     validate_commit_message,
 )
-from git_helper.diff_viewer import app_diff_viewer
 from git_helper.file_utils import (
     get_commit_message_from_pending_file,
     get_pending_file_path,
     update_pending_changes,
 )
-from git_helper.git_utils import get_file_changes, get_repo_root
+from git_helper.git_utils import get_file_changes, get_repo_info
+from git_helper.models import RepoInfo
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
 console = Console()
 
@@ -30,17 +29,39 @@ console = Console()
 def cli():
     """Git Workflow Tool - A structured approach to git commits."""
     logger.debug("git workflow tool -> cli")
-    pass
+
+
+def _repo_info() -> RepoInfo:
+    """Get the repository info, resolved at first use and kept on the root context.
+
+    Only commands that need a repository resolve it, so e.g. `--help` works anywhere.
+    """
+    ctx = click.get_current_context().find_root()
+    if ctx.obj is None:
+        ctx.obj = get_repo_info()
+    return ctx.obj
+
+
+def _load_changes_and_message(repo: RepoInfo, message: str = None):
+    """Get the file changes and the commit message, reading the pending file while git runs."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        changes = executor.submit(get_file_changes, repo.root)
+        if not message:
+            try:
+                message = get_commit_message_from_pending_file(
+                    get_pending_file_path(repo.root)
+                )
+            except FileNotFoundError:
+                message = ""
+        return changes.result(), message
 
 
 def _prepare(message: str = None):
-    repo_path = get_repo_root()
-    changes = get_file_changes(repo_path)
-    message = message or get_commit_message_from_pending_file(
-        get_pending_file_path(repo_path)
-    )
+    repo = _repo_info()
+    repo_path = repo.root
+    changes, message = _load_changes_and_message(repo, message)
     update_pending_changes(repo_path, changes, message)
-    return f"\n[green]Updated[/green] {os.path.join(repo_path, 'pending-changes.md')} with current changes."
+    return f"\n[green]Updated[/green] {get_pending_file_path(repo_path)} with current changes."
 
 
 @cli.command()
@@ -53,11 +74,15 @@ def review(keylog: bool):
 
 
 def _review(keylog: bool):
+    # Textual and rich.markdown are only needed here, so keep them off the startup path
+    from rich.markdown import Markdown
+
+    from git_helper.diff_viewer import app_diff_viewer
+
     logger.debug("review pending changes")
-    repo_path = get_repo_root()
-    changes = get_file_changes(repo_path)
-    pending_file = get_pending_file_path(repo_path)
-    message = get_commit_message_from_pending_file(pending_file)
+    repo = _repo_info()
+    repo_path = repo.root
+    changes, message = _load_changes_and_message(repo)
     update_pending_changes(repo_path, changes, message)
 
     is_valid, error_message = validate_commit_message(message)
@@ -119,15 +144,18 @@ def _commit(message: str, amend: bool):
     logger.debug("commit changes")
 
     # Get repo root
-    repo_path = get_repo_root()
+    repo_path = _repo_info().root
 
     # Prepare pending-changes.md
     pending_file = get_pending_file_path(repo_path)
-    if not os.path.exists(pending_file):
+    try:
+        pending_message = get_commit_message_from_pending_file(pending_file)
+    except FileNotFoundError:
         _prepare()
+        pending_message = get_commit_message_from_pending_file(pending_file)
 
     # Validate commit message
-    message = message or get_commit_message_from_pending_file(pending_file)
+    message = message or pending_message
     is_valid, error_message = validate_commit_message(message)
     if not is_valid:
         return "[red]Error:[/red] Commit message is not valid"
@@ -143,11 +171,10 @@ def _commit(message: str, amend: bool):
         return "[yellow]Commit aborted by user.[/yellow]"
 
     # Commit changes
-    git = Git(repo_path)
-    args = ["-m", message]
+    args = ["git", "commit", "-m", message]
     if amend:
         args.append("--amend")
-    git.commit(*args)
+    subprocess.run(args, cwd=repo_path, check=True)
     # repo.index.commit(message, amend=amend)
 
     # Clean up pending-changes.md
@@ -1,10 +1,11 @@
 """Commit message validation using conventional commits specification."""
 
 import re
-from typing import Optional, Tuple, Set
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(frozen=True)
 class ConventionalCommit:
     """Represents a parsed conventional commit message."""
     type: str
@@ -12,27 +13,30 @@ class ConventionalCommit:
     description: str
     body: Optional[str]
     breaking: bool
-    footers: list[str]
+    footers: Tuple[str, ...]
+
+ALLOWED_TYPES: FrozenSet[str] = frozenset({
+    'feat', 'fix', 'docs', 'style', 'refactor',
+    'perf', 'test', 'build', 'ci', 'chore', 'revert'
+})
+
+_INVALID_TYPE_TEMPLATE = "Invalid type '{}'. Allowed types are: " + ", ".join(sorted(ALLOWED_TYPES))
 
 class CommitValidator:
     """Validates commit messages against the Conventional Commits specification."""
     
+    # Header line only; body and footers are split off without regex backtracking
     COMMIT_PATTERN = re.compile(
-        r"^(?P<type>[a-z]+)"
+        r"(?P<type>[a-z]+)"
         r"(?:\((?P<scope>[a-z0-9/-]+)\))?"
         r"(?P<breaking>!)?"
         r": "
-        r"(?P<description>(?:(?!^(feat|fix|docs|style|refactor|perf|test|build|ci|chore|revert)(\(|\!|\:)).*(?:\n(?!\n).*)*)?)"
-        r"(?:\n\n(?P<body>(?:(?!^(feat|fix|docs|style|refactor|perf|test|build|ci|chore|revert)(\(|\!|\:)).*(?:\n.*)*)?))?"
-        r"(?:\n\n(?P<footer>(?:(?!^(feat|fix|docs|style|refactor|perf|test|build|ci|chore|revert)(\(|\!|\:)).*(?:\n.*)*)?))?"
-        r"$",
-        re.MULTILINE
     )
+
+    # Footer lines look like "Token: value", "Token #value" or "BREAKING CHANGE: value"
+    FOOTER_PATTERN = re.compile(r"(?:BREAKING CHANGE|[A-Za-z-]+)(?:: | #)")
     
-    ALLOWED_TYPES: Set[str] = {
-        'feat', 'fix', 'docs', 'style', 'refactor',
-        'perf', 'test', 'build', 'ci', 'chore', 'revert'
-    }
+    ALLOWED_TYPES: FrozenSet[str] = ALLOWED_TYPES
 
     @classmethod
     def parse_commit_message(cls, message: str) -> Optional[ConventionalCommit]:
@@ -45,23 +49,69 @@ class CommitValidator:
         Returns:
             ConventionalCommit object if valid, None if invalid
         """
-        match = cls.COMMIT_PATTERN.match(message)
-        if not match:
-            return None
+        return _parse_commit_message(message)
+
+    @classmethod
+    def _parse_body_footers(cls, rest: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """
+        Split the text after the description into body and footers in a single pass.
+        
+        Args:
+            rest: The commit message text following the description's blank line
             
-        groups = match.groupdict()
-        return ConventionalCommit(
-            type=groups['type'],
-            scope=groups['scope'],
-            description=groups['description'].strip() if groups['description'] else '',
-            body=groups['body'].strip() if groups['body'] else None,
-            breaking=bool(groups['breaking']),
-            footers=groups['footer'].strip().split('\n') if groups['footer'] else []
-        )
+        Returns:
+            Tuple of (body, footers), where footers are the lines of a final
+            paragraph made up only of footer lines
+        """
+        body_lines: list[str] = []
+        paragraph: list[str] = []
+        for line in rest.splitlines():
+            if line:
+                paragraph.append(line)
+            elif paragraph:
+                # Blank line ends a paragraph, which is therefore part of the body
+                body_lines.extend(paragraph)
+                body_lines.append("")
+                paragraph = []
+
+        if paragraph and all(cls.FOOTER_PATTERN.match(line) for line in paragraph):
+            footers = tuple(paragraph)
+        else:
+            body_lines.extend(paragraph)
+            footers = ()
+
+        body = "\n".join(body_lines).strip()
+        return body or None, footers
 
+@lru_cache(maxsize=32)
+def _parse_commit_message(message: str) -> Optional[ConventionalCommit]:
+    """
+    Parse a commit message, memoized per message.
+
+    Kept at module level so the cache does not hold a reference to the class.
+    """
+    match = CommitValidator.COMMIT_PATTERN.match(message)
+    if not match:
+        return None
+
+    # The description runs up to the first blank line
+    description, _, rest = message[match.end():].partition("\n\n")
+    body, footers = CommitValidator._parse_body_footers(rest)
+    return ConventionalCommit(
+        type=match.group('type'),
+        scope=match.group('scope'),
+        description=description.strip(),
+        body=body,
+        breaking=bool(match.group('breaking')),
+        footers=footers
+    )
+
+@lru_cache(maxsize=32)
 def validate_commit_message(message: str) -> Tuple[bool, Optional[str]]:
     """
     Validate a commit message against the Conventional Commits specification.
+
+    Results are memoized per message, since callers validate the same text repeatedly.
     
     Args:
         message: The commit message to validate
@@ -72,19 +122,41 @@ def validate_commit_message(message: str) -> Tuple[bool, Optional[str]]:
     """
     if not message:
         return False, "Commit message cannot be empty"
+
+    # Reject unknown types from the prefix alone, before parsing the message
+    colon = message.find(":")
+    if colon <= 0:
+        return False, "Invalid commit message format. Expected format: type(scope?): description"
+    head = message[:colon].split("(", 1)[0].rstrip("!")
+    if head.isascii() and head.isalpha() and head.islower() and head not in ALLOWED_TYPES:
+        return False, _INVALID_TYPE_TEMPLATE.format(head)
         
     commit = CommitValidator.parse_commit_message(message)
     if not commit:
         return False, "Invalid commit message format. Expected format: type(scope?): description"
         
-    if commit.type not in CommitValidator.ALLOWED_TYPES:
-        return False, f"Invalid type '{commit.type}'. Allowed types are: {', '.join(sorted(CommitValidator.ALLOWED_TYPES))}"
+    if commit.type not in ALLOWED_TYPES:
+        return False, _INVALID_TYPE_TEMPLATE.format(commit.type)
         
     if not commit.description:
         return False, "Commit message must include a description"
         
     return True, None
 
+# Common error mappings to more user-friendly messages, keyed by lowercase substring
+_ERROR_MAPPINGS = (
+    ("invalid commit message format",
+        "Commit message must follow the format: type(scope?): description\n"
+        "Examples:\n"
+        "  feat: add new feature\n"
+        "  fix(auth): resolve login issue\n"
+        "  docs: update README"),
+    ("invalid type",
+        "Type must be one of: feat, fix, docs, style, refactor, perf, test, build, ci, chore, revert"),
+    ("must include a description",
+        "Description cannot be empty. Add a clear, concise description of the change."),
+)
+
 def format_validation_error(error: str) -> str:
     """
     Format a validation error message to be more user-friendly.
@@ -95,22 +167,9 @@ def format_validation_error(error: str) -> str:
     Returns:
         A formatted error message with suggestions if applicable
     """
-    # Common error mappings to more user-friendly messages
-    error_mappings = {
-        "invalid commit message format": 
-            "Commit message must follow the format: type(scope?): description\n"
-            "Examples:\n"
-            "  feat: add new feature\n"
-            "  fix(auth): resolve login issue\n"
-            "  docs: update README",
-        "invalid type": 
-            "Type must be one of: feat, fix, docs, style, refactor, perf, test, build, ci, chore, revert",
-        "must include a description":
-            "Description cannot be empty. Add a clear, concise description of the change."
-    }
-    
-    for key, friendly_message in error_mappings.items():
-        if key.lower() in error.lower():
+    error_lower = error.lower()
+    for key, friendly_message in _ERROR_MAPPINGS:
+        if key in error_lower:
             return friendly_message
             
     return error
@@ -1,8 +1,10 @@
 """Module for handling interactive diff viewing."""
 
 import re
-from typing import List
+from functools import lru_cache
+from typing import Dict, List
 
+import git
 from rich import box
 from rich.console import Console
 from rich.markdown import Markdown
@@ -12,13 +14,40 @@ from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
-from textual.keys import Keys
 from textual.widgets import Footer, Header, RichLog, Static
 
 from git_helper.commit_validator import validate_commit_message
-from git_helper.git_utils import FileChange, get_file_diff
+from git_helper.git_utils import FileChange, get_file_diff, get_file_diffs
 from git_helper.models import DiffHunk
 
+_HUNK_START_RE = re.compile(r"@@ -(\d+)")
+_HUNK_HEADER_RE = re.compile(r"@@ -\d+,\d+ \+\d+,\d+ @@\n")
+
+# Diffs above this size are not rendered, since Syntax highlighting is linear in the text
+MAX_DIFF_SIZE = 256 * 1024
+# Longer hunks are truncated before rendering
+MAX_HUNK_SIZE = 64 * 1024
+SKIPPED_DIFF = "[binary or oversized diff skipped]"
+
+
+@lru_cache(maxsize=32)
+def _render_syntax(content: str) -> Syntax:
+    """Build the highlighted view of a hunk once, so revisiting it reuses the renderable."""
+    # Tabs are already expanded when the diff is parsed
+    return Syntax(
+        _HUNK_HEADER_RE.sub("", content),
+        "diff",
+        theme="monokai",
+        word_wrap=True,
+        tab_size=4,
+    )
+
+
+@lru_cache(maxsize=8)
+def _render_markdown(text: str) -> Markdown:
+    """Parse markdown once per distinct text; the renderable can be drawn repeatedly."""
+    return Markdown(text)
+
 
 class CommitMessage(RichLog):
     """Widget for displaying the commit message with validation."""
@@ -34,7 +63,7 @@ class CommitMessage(RichLog):
         # Add commit message
         self.write(
             Panel(
-                Markdown(self.message),
+                _render_markdown(self.message),
                 title="Commit Message",
                 border_style=panel_style,
             )
@@ -44,7 +73,7 @@ class CommitMessage(RichLog):
         if not is_valid:
             self.write(
                 Panel(
-                    Markdown(error_message),
+                    _render_markdown(error_message),
                     title="Error Message",
                     box=box.MINIMAL,
                     expand=True,
@@ -62,10 +91,20 @@ class FileList(RichLog):
         self.current_file = current_file
 
     def on_mount(self) -> None:
+        self._write_table()
+
+    def update_current_file(self, current_file: str) -> None:
+        """Re-render the table with a new highlighted file."""
+        self.current_file = current_file
+        self.clear()
+        self._write_table()
+
+    def _write_table(self) -> None:
         from git_helper.formatters import format_rich_table
 
-        table = format_rich_table(self.changes, current_file=self.current_file)
-        table.columns = table.columns[:2]  # Only show file and status
+        table = format_rich_table(
+            self.changes, current_file=self.current_file, columns=("file", "status")
+        )
 
         self.write(
             Panel(
@@ -86,19 +125,19 @@ class DiffView(RichLog):
         self.view_title = title
 
     def on_mount(self) -> None:
-        if self.content:
-            # Process content
-            content = self.content.expandtabs(4)
-            content = re.sub(r"@@ -\d+,\d+ \+\d+,\d+ @@\n", "", content)
-
-            syntax = Syntax(
-                content,
-                "diff",
-                theme="monokai",
-                word_wrap=True,
-                tab_size=4,
-            )
+        self._write_content()
 
+    def update_content(self, content: str, title: str) -> None:
+        """Replace the displayed diff in place."""
+        self.content = content
+        self.view_title = title
+        self.clear()
+        self._write_content()
+        self.scroll_home(animate=False)
+
+    def _write_content(self) -> None:
+        if self.content:
+            syntax = _render_syntax(self.content)
         else:
             syntax = Text("No changes to display")
 
@@ -161,10 +200,18 @@ class DiffViewer(Static):
         self.error_message = error_message
         self.current_file_index = 0
         self.current_change_index = 0
-        self.current_hunks: List[DiffHunk] = []
+        # Parsed hunks per file, so revisiting a file does not re-run git
+        self._hunks_cache: Dict[str, List[DiffHunk]] = {}
+        # Navigation keys only mark the panels dirty; a burst of keys renders once
+        self._refresh_pending = False
+        self._refresh_file_table = False
+        # Raw diffs fetched when the viewer is composed, consumed as each file is first parsed
+        self._diff_cache: Dict[str, str] = {}
 
     def compose(self) -> ComposeResult:
         """Create the UI layout."""
+        if self.changes:
+            self._prefetch_diffs()
 
         with Horizontal():
             # Left panel with commit message and file list
@@ -175,11 +222,8 @@ class DiffViewer(Static):
             # Right panel with diff view
             with Vertical(classes="right-panel"):
                 if self.changes:
-                    current_file = self.changes[self.current_file_index].file
-                    title = f"Diff View ({current_file})"
-                    if self.current_hunks:
-                        title += f" - Change {self.current_change_index + 1}/{len(self.current_hunks)}"
-                    yield DiffView(self._get_current_diff(), title)
+                    content = self._get_current_diff()
+                    yield DiffView(content, self._get_diff_title())
                 else:
                     yield DiffView()
 
@@ -189,148 +233,180 @@ class DiffViewer(Static):
             return "No files"
         return self.changes[self.current_file_index].file
 
+    def _get_diff_title(self) -> str:
+        """Get the diff panel title for the current file and change."""
+        current_file = self._get_current_filename()
+        title = f"Diff View ({current_file})"
+        hunks = self._hunks_cache.get(current_file)
+        if hunks:
+            title += f" - Change {self.current_change_index + 1}/{len(hunks)}"
+        return title
+
+    def refresh_diff_panel(self) -> None:
+        """Update only the diff panel for the current file and change."""
+        content = self._get_current_diff()
+        self.query_one(DiffView).update_content(content, self._get_diff_title())
+
+    def refresh_file_table(self) -> None:
+        """Update only the file list highlight."""
+        self.query_one(FileList).update_current_file(self._get_current_filename())
+
     def _parse_diff_hunks(self, diff_content: str) -> List[DiffHunk]:
         """Parse diff content into separate hunks."""
+        # The diff header sits before the first hunk and is dropped with parts[0]
+        parts = ("\n" + diff_content).split("\n@@")
         hunks = []
-        current_hunk = []
-        current_start = 0
-        in_hunk = False
-
-        for line in diff_content.splitlines():
-            # Strip ANSI escape codes from the line
-            bare_line = re.sub(r"\x1b\[[0-9;]*[mG]", "", line.strip())
-
-            if bare_line.startswith("diff --git"):
-                continue  # Skip diff header
-            if bare_line.startswith("@@"):
-                # New hunk found, save previous if exists
-                if current_hunk:
-                    hunks.append(DiffHunk(current_start, "\n".join(current_hunk)))
-                # Parse the @@ line to get starting line number
-                match = re.search(r"@@ -(\d+)", line)
-                current_start = int(match.group(1)) if match else 0
-                current_hunk = [line]
-                in_hunk = True
-            elif in_hunk:
-                current_hunk.append(line)
-
-        # Add the last hunk
-        if current_hunk:
-            hunks.append(DiffHunk(current_start, "\n".join(current_hunk)))
+        for part in parts[1:]:
+            content = "@@" + part.rstrip("\n")
+            # Parse the @@ line to get starting line number
+            match = _HUNK_START_RE.match(content)
+            hunks.append(DiffHunk(int(match.group(1)) if match else 0, content))
+
+        return hunks
 
+    def _get_current_hunks(self) -> List[DiffHunk]:
+        """Get the hunks for the current file, parsing its diff on first visit."""
+        change = self.changes[self.current_file_index]
+        hunks = self._hunks_cache.get(change.file)
+        if hunks is None:
+            if change.description == "Binary file":
+                hunks = [DiffHunk(0, SKIPPED_DIFF)]
+            else:
+                hunks = self._load_hunks(change)
+            self._hunks_cache[change.file] = hunks
         return hunks
 
+    def _prefetch_diffs(self) -> None:
+        """Fetch the diffs of all changed files with a single git process."""
+        files = [change.file for change in self.changes if change.description != "Binary file"]
+        try:
+            self._diff_cache = get_file_diffs(files, unified=10000)
+        except git.exc.GitCommandError:
+            # Fall back to fetching each file's diff when it is first shown
+            self._diff_cache = {}
+
+    def _load_hunks(self, change: FileChange) -> List[DiffHunk]:
+        """Fetch and parse the diff for a file, skipping binary and oversized diffs."""
+        diff_content = self._diff_cache.pop(change.file, None)
+        if diff_content is None:
+            diff_content = get_file_diff(change, unified=10000)
+        head = diff_content[:4096]
+        if len(diff_content) > MAX_DIFF_SIZE or "\x00" in head or "\nBinary files " in head:
+            return [DiffHunk(0, SKIPPED_DIFF)]
+
+        # git is asked for uncolored output, so only tabs need expanding
+        diff_content = diff_content.expandtabs(4)
+        return self._parse_diff_hunks(diff_content)
+
     def _get_current_diff(self) -> str:
         """Get the diff for the current file."""
-        if not self.current_hunks:
-            diff_content = get_file_diff(
-                self.changes[self.current_file_index], unified=10000
-            )
-            diff_content = diff_content.expandtabs(4)
-            self.current_hunks = self._parse_diff_hunks(diff_content)
-            self.current_change_index = 0
-
-        if self.current_hunks:
-            return self.current_hunks[self.current_change_index].content
+        hunks = self._get_current_hunks()
+        if hunks:
+            content = hunks[self.current_change_index].content
+            if len(content) > MAX_HUNK_SIZE:
+                content = content[:MAX_HUNK_SIZE] + "\n... [hunk truncated]"
+            return content
 
         return "No changes to display"
 
+    def advance_file(self, delta: int) -> bool:
+        """Move the file index by delta, clamped to the file list."""
+        index = max(0, min(len(self.changes) - 1, self.current_file_index + delta))
+        if not self.changes or index == self.current_file_index:
+            return False
+        self.current_file_index = index
+        self.current_change_index = 0
+        self._schedule_refresh(file_table=True)
+        return True
+
+    def advance_change(self, delta: int) -> bool:
+        """Move the change index by delta, clamped to the current file's hunks."""
+        if not self.changes:
+            return False
+        hunks = self._get_current_hunks()
+        index = max(0, min(len(hunks) - 1, self.current_change_index + delta))
+        if index == self.current_change_index:
+            return False
+        self.current_change_index = index
+        self._schedule_refresh()
+        return True
+
+    def _schedule_refresh(self, file_table: bool = False) -> None:
+        """Refresh the panels once, after the keys already queued have been handled."""
+        self._refresh_file_table = self._refresh_file_table or file_table
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.app.call_later(self._apply_refresh)
+
+    def _apply_refresh(self) -> None:
+        """Render the net result of a burst of navigation keys."""
+        self._refresh_pending = False
+        # Repaint once for both panels
+        with self.app.batch_update():
+            if self._refresh_file_table:
+                self._refresh_file_table = False
+                self.refresh_file_table()
+            self.refresh_diff_panel()
+
     def action_next_file(self) -> None:
         """Move to next file."""
-        if self.current_file_index < len(self.changes) - 1:
-            self.current_file_index += 1
-            self.current_change_index = 0
-            self.current_hunks = []
-            self.refresh(recompose=True)
+        self.advance_file(1)
 
     def action_prev_file(self) -> None:
         """Move to previous file."""
-        if self.current_file_index > 0:
-            self.current_file_index -= 1
-            self.current_change_index = 0
-            self.current_hunks = []
-            self.refresh(recompose=True)
+        self.advance_file(-1)
 
     def action_next_change(self) -> None:
         """Move to next change in current file."""
-        if not self.current_hunks:
-            diff_content = get_file_diff(self.changes[self.current_file_index])
-            self.current_hunks = self._parse_diff_hunks(diff_content)
-
-        if self.current_change_index < len(self.current_hunks) - 1:
-            self.current_change_index += 1
-            current_file = self.changes[self.current_file_index].file
-            title = f"Diff View ({current_file}) - Change {self.current_change_index + 1}/{len(self.current_hunks)}"
-            self.mount(
-                DiffView(self._get_current_diff(), title),
-                after=self.query_one(FileList),
-            )
-            self.refresh(recompose=True)
+        self.advance_change(1)
 
     def action_prev_change(self) -> None:
         """Move to previous change in current file."""
-        if not self.current_hunks:
-            diff_content = get_file_diff(self.changes[self.current_file_index])
-            self.current_hunks = self._parse_diff_hunks(diff_content)
-
-        if self.current_change_index > 0:
-            self.current_change_index -= 1
-            current_file = self.changes[self.current_file_index].file
-            title = f"Diff View ({current_file}) - Change {self.current_change_index + 1}/{len(self.current_hunks)}"
-            self.mount(
-                DiffView(self._get_current_diff(), title),
-                after=self.query_one(FileList),
-            )
-            self.refresh(layout=True)
+        self.advance_change(-1)
 
     def action_scroll_up(self) -> None:
         """Scroll up one line."""
         self.query_one(DiffView).scroll_up()
-        self.refresh(recompose=True)
 
     def action_scroll_down(self) -> None:
         """Scroll down one line."""
         self.query_one(DiffView).scroll_down()
-        self.refresh(recompose=True)
 
     def action_page_up(self) -> None:
         """Scroll up one page."""
         self.query_one(DiffView).scroll_page_up()
-        self.refresh(recompose=True)
 
     def action_page_down(self) -> None:
         """Scroll down one page."""
         self.query_one(DiffView).scroll_page_down()
-        self.refresh(recompose=True)
 
     def action_scroll_home(self) -> None:
         """Scroll to the top of the diff view."""
         self.query_one(DiffView).scroll_home()
-        self.refresh(recompose=True)
 
     def action_scroll_end(self) -> None:
         """Scroll to the bottom of the diff view."""
         self.query_one(DiffView).scroll_end()
-        self.refresh(recompose=True)
 
 
 class DiffViewerApp(App):
     """Application for reviewing changes."""
 
+    # Navigation keys all route through action_viewer to the DiffViewer
     BINDINGS = [
         Binding("q", "quit", "Quit"),
-        Binding("j", "prev_change", "Previous Change"),
-        Binding("k", "next_change", "Next Change"),
-        Binding("h", "prev_file", "Previous File"),
-        Binding("l", "next_file", "Next File"),
-        Binding("left", "prev_file", "Previous File"),
-        Binding("right", "next_file", "Next File"),
-        # Binding("up", "scroll_up", "Scroll Up"),
-        # Binding("down", "scroll_down", "Scroll Down"),
-        # Binding("pageup", "page_up", "Page Up"),
-        # Binding("pagedown", "page_down", "Page Down"),
-        # Binding("home", "scroll_home", "Top"),
-        # Binding("end", "scroll_end", "Bottom"),
+        Binding("j", "viewer('prev_change')", "Previous Change"),
+        Binding("k", "viewer('next_change')", "Next Change"),
+        Binding("h", "viewer('prev_file')", "Previous File"),
+        Binding("l", "viewer('next_file')", "Next File"),
+        Binding("left", "viewer('prev_file')", "Previous File"),
+        Binding("right", "viewer('next_file')", "Next File"),
+        # Binding("up", "viewer('scroll_up')", "Scroll Up"),
+        # Binding("down", "viewer('scroll_down')", "Scroll Down"),
+        # Binding("pageup", "viewer('page_up')", "Page Up"),
+        # Binding("pagedown", "viewer('page_down')", "Page Down"),
+        # Binding("home", "viewer('scroll_home')", "Top"),
+        # Binding("end", "viewer('scroll_end')", "Bottom"),
     ]
 
     CSS = """
@@ -386,59 +462,19 @@ class DiffViewerApp(App):
             yield self.key_log
         yield Footer()
 
+    def _log(self, text: str) -> None:
+        """Write to the key log, skipping the work when it is not shown."""
+        if self.show_key_log:
+            self.key_log.write(text)
+
     def on_key(self, event) -> None:
         """Log all key presses."""
-        self.key_log.write(f"Key pressed: {event.key}")
+        self._log(f"Key pressed: {event.key}")
 
-    def action_prev_file(self) -> None:
-        """Move to previous file."""
-        self.key_log.write("Action: prev_file")
-        self.viewer.action_prev_file()
-
-    def action_next_file(self) -> None:
-        """Move to next file."""
-        self.key_log.write("Action: next_file")
-        self.viewer.action_next_file()
-
-    def action_prev_change(self) -> None:
-        """Move to previous change."""
-        self.key_log.write("Action: prev_change")
-        self.viewer.action_prev_change()
-
-    def action_next_change(self) -> None:
-        """Move to next change."""
-        self.key_log.write("Action: next_change")
-        self.viewer.action_next_change()
-
-    def action_scroll_up(self) -> None:
-        """Scroll up one line."""
-        self.query_one(DiffView).scroll_up()
-        self.refresh(recompose=True)
-
-    def action_scroll_down(self) -> None:
-        """Scroll down one line."""
-        self.query_one(DiffView).scroll_down()
-        self.refresh(recompose=True)
-
-    def action_page_up(self) -> None:
-        """Scroll up one page."""
-        self.query_one(DiffView).scroll_page_up()
-        self.refresh(recompose=True)
-
-    def action_page_down(self) -> None:
-        """Scroll down one page."""
-        self.query_one(DiffView).scroll_page_down()
-        self.refresh(recompose=True)
-
-    def action_scroll_home(self) -> None:
-        """Scroll to the top."""
-        self.query_one(DiffView).scroll_home()
-        self.refresh(recompose=True)
-
-    def action_scroll_end(self) -> None:
-        """Scroll to the bottom."""
-        self.query_one(DiffView).scroll_end()
-        self.refresh(recompose=True)
+    def action_viewer(self, action: str) -> None:
+        """Dispatch a bound action to the diff viewer."""
+        self._log(f"Action: {action}")
+        getattr(self.viewer, f"action_{action}")()
 
 
 def app_diff_viewer(
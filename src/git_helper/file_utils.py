@@ -2,14 +2,21 @@
 
 import datetime
 import os
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 from git.cmd import Git
 
-from .formatters import format_markdown_table
-from .git_utils import get_file_changes
+from .formatters import iter_markdown_table
+from .git_utils import split_diff_by_file
 from .models import FileChange
 
+# Section headings that delimit the draft commit message in pending-changes.md
+MESSAGE_HEADER = "## Draft Commit Message"
+FILES_HEADER = "## Modified Files"
+
+# Longest per-file diff embedded in pending-changes.md before the rest is elided
+MAX_DIFF_LINES = 300
 
 DRAFT_MESSAGE = """type: concise description of changes
 
@@ -20,73 +27,104 @@ DRAFT_MESSAGE = """type: concise description of changes
 ]
 """
 
+# Legend and notes that follow the table of modified files
+FILES_LEGEND = """
+W - Working Dir | S - Staged | ? - New | A - Added | M - Modified | D - Deleted | R - Renamed
 
-def update_pending_changes(
-    repo_path: str, changes: List[FileChange], message: str = None
-) -> None:
-    """Update pending-changes.md with current changes."""
-    changes = get_file_changes(repo_path)
+!!!WARNING!!! Please update the commit message before committing!
 
-    current_time = datetime.datetime.now().strftime("%Y-%m-%d")
+!!!WARNING!!! Only staged files will be commited. Please stage changes you wish to commit.
 
-    diff_output = ""
-    if len(changes):
-        # Get git diff for all changed files
-        for change in changes:
-            if os.path.exists(change.file):
-                result = Git(repo_path).diff("--no-color", "HEAD", change.file)
-                diff_output += f"\n---\n\n### {change.file}\n```diff\n{result}\n```\n"
+## Detailed Changes
+"""
 
-    content_message = message or DRAFT_MESSAGE
-    content = f"""# Pending Changes ({current_time})
 
-## Draft Commit Message
+def _truncate_diff(diff: str, max_lines: Optional[int]) -> str:
+    """Keep the first max_lines lines of a diff and note how many were left out."""
+    if max_lines is None:
+        return diff
+    lines = diff.split("\n", max_lines)
+    if len(lines) <= max_lines:
+        return diff
+    elided = lines.pop().count("\n") + 1
+    return "\n".join(lines) + f"\n... ({elided} more lines elided)"
 
-{content_message}
 
-## Modified Files
+def update_pending_changes(
+    repo_path: str,
+    changes: List[FileChange],
+    message: str = None,
+    max_diff_lines: Optional[int] = MAX_DIFF_LINES,
+) -> None:
+    """Update pending-changes.md with the changes computed by the caller.
 
-{format_markdown_table(changes)}
+    Each file's diff is cut to max_diff_lines lines; pass None to embed it in full.
+    """
 
-W - Working Dir | S - Staged | ? - New | A - Added | M - Modified | D - Deleted | R - Renamed
+    current_time = datetime.date.today().isoformat()
 
-!!!WARNING!!! Please update the commit message before committing!
+    # Get git diff for all changed files in one git process, before the file is truncated
+    files = [change.file for change in changes if os.path.exists(change.file)]
+    file_diffs = (
+        split_diff_by_file(
+            Git(repo_path)(c="core.quotePath=false").diff("--no-color", "HEAD", "--", *files)
+        )
+        if files
+        else {}
+    )
 
-!!!WARNING!!! Only staged files will be commited. Please stage changes you wish to commit.
+    content_message = message or DRAFT_MESSAGE
+    header = f"""# Pending Changes ({current_time})
+
+{MESSAGE_HEADER}
+
+{content_message}
+
+{FILES_HEADER}
 
-## Detailed Changes
-{diff_output}
 """
 
+    # Write the table rows and each file's diff section as they are formatted,
+    # rather than building the whole document as one string
     with open(get_pending_file_path(repo_path), "w", encoding="utf-8") as f:
-        f.write(content)
+        f.write(header)
+        for line in iter_markdown_table(changes):
+            f.write(f"{line}\n")
+        f.write(FILES_LEGEND)
+        for file in files:
+            diff = _truncate_diff(file_diffs.get(file, ""), max_diff_lines)
+            f.write(f"\n---\n\n### {file}\n```diff\n{diff}\n```\n")
+        f.write("\n")
 
     return
 
 
 def get_commit_message_from_pending_file(pending_file: str) -> str:
-    try:
-        with open(pending_file, "r", encoding="utf-8") as f:
-            content = f.read()
-        start = content.find("## Draft Commit Message") + 24
-        end = content.find("## Modified Files")
-        return content[start:end].strip()
-    except FileNotFoundError:
-        return ""
+    """Read the draft commit message; raises FileNotFoundError if there is no pending file."""
+    # The message is near the top, so stop at the files heading rather than read the diffs
+    lines = []
+    with open(pending_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(FILES_HEADER):
+                break
+            lines.append(line)
+    _, _, message = "".join(lines).partition(MESSAGE_HEADER)
+    return message.strip()
 
 
 def set_commit_message_to_pending_file(pending_file: str, message: str) -> None:
-    new_content = None
-    with open(pending_file, "r", encoding="utf-8") as f:
-        content = f.read()
-        start = content.find("## Draft Commit Message") + 24
-        end = content.find("## Modified Files")
-        new_content = content[:start] + "\n" + message + "\n\n" + content[end:]
-    with open(pending_file, "w", encoding="utf-8") as f:
-        f.write(new_content)
+    # Rewrite in place through one handle rather than reopening the file to write
+    with open(pending_file, "r+", encoding="utf-8") as f:
+        head, _, tail = f.read().partition(MESSAGE_HEADER)
+        _, _, rest = tail.partition(FILES_HEADER)
+        f.seek(0)
+        f.write(f"{head}{MESSAGE_HEADER}\n\n{message}\n\n{FILES_HEADER}{rest}")
+        f.truncate()
 
 
+@lru_cache(maxsize=None)
 def get_pending_file_path(repo_path: str) -> str:
+    """Get the pending changes file path, creating the state directory on first use."""
     state_dir = os.path.join(repo_path, ".gw-state")
     if not os.path.exists(state_dir):
         os.makedirs(state_dir)
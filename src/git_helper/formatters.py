@@ -1,6 +1,6 @@
 """Formatting utilities for git workflow."""
 
-from typing import List
+from typing import Iterator, List, Sequence
 
 from rich.table import Table
 from rich import box
@@ -8,69 +8,89 @@ from rich import box
 from .models import FileChange
 
 
-def format_rich_table(changes: List[FileChange], current_file: str = None) -> Table:
-    """Format changes into a rich table."""
+# Header row of the markdown table of changes
+MARKDOWN_HEADERS = ("File", "Status", "Added", "Removed", "% Changed", "Description")
+
+# Column name -> (add_column arguments, cell formatter)
+RICH_TABLE_COLUMNS = {
+    "file": ({"header": "File", "style": "cyan"}, lambda c: c.file),
+    "status": (
+        {"header": "Status", "style": "magenta"},
+        lambda c: c.status2 + "/" + c.status,
+    ),
+    "added": (
+        {"header": "Added", "justify": "right", "style": "green"},
+        lambda c: str(c.added_lines),
+    ),
+    "removed": (
+        {"header": "Removed", "justify": "right", "style": "red"},
+        lambda c: str(c.removed_lines),
+    ),
+    "percent": (
+        {"header": "% Changed", "justify": "right"},
+        lambda c: f"{c.percent_changed:.1f}%",
+    ),
+    "description": ({"header": "Description"}, lambda c: c.description or ""),
+}
+
+
+def format_rich_table(
+    changes: List[FileChange],
+    current_file: str = None,
+    columns: Sequence[str] = tuple(RICH_TABLE_COLUMNS),
+) -> Table:
+    """Format changes into a rich table with only the requested columns."""
     if not changes:
         return None
 
     table = Table(box=box.MINIMAL, expand=True)
-    table.add_column("File", style="cyan")
-    table.add_column("Status", style="magenta")
-    table.add_column("Added", justify="right", style="green")
-    table.add_column("Removed", justify="right", style="red")
-    table.add_column("% Changed", justify="right")
-    table.add_column("Description")
+    formatters = []
+    for name in columns:
+        column_args, formatter = RICH_TABLE_COLUMNS[name]
+        table.add_column(**column_args)
+        formatters.append(formatter)
 
     for change in changes:
         # Highlight current file with bold and reverse video
         file_style = "bold reverse" if change.file == current_file else ""
 
         table.add_row(
-            change.file,
-            change.status2 + "/" + change.status,
-            str(change.added_lines),
-            str(change.removed_lines),
-            f"{change.percent_changed:.1f}%",
-            change.description or "",
+            *[formatter(change) for formatter in formatters],
             style=file_style,  # Apply style to entire row
         )
 
     return table
 
 
-def format_markdown_table(changes: List[FileChange]) -> str:
-    """Format changes into a markdown table with consistent column widths."""
+def iter_markdown_table(changes: List[FileChange]) -> Iterator[str]:
+    """Yield the lines of a markdown table of changes with consistent column widths.
+
+    Lines come one at a time and without line endings, so they can be written as
+    they are formatted.
+    """
     if not changes:
-        return "No changes detected."
+        yield "No changes detected."
+        return
 
-    # Define column headers and widths
-    headers = ["File", "Status", "Added", "Removed", "% Changed", "Description"]
     rows = [
-        [
+        (
             change.file,
             change.status2 + "/" + change.status,
             str(change.added_lines),
             str(change.removed_lines),
             f"{change.percent_changed:.1f}%",
             change.description,
-        ]
+        )
         for change in changes
     ]
-
-    # Calculate column widths
-    widths = [len(h) for h in headers]
-    for row in rows:
-        for i, cell in enumerate(row):
-            widths[i] = max(widths[i], len(cell))
-
-    # Format table
-    sep = "|".join("-" * (w + 2) for w in widths)
-    header = "|".join(f" {h:<{w}} " for h, w in zip(headers, widths))
-
-    table_rows = [
-        "|".join(f" {cell:<{w}} " for cell, w in zip(row, widths)) for row in rows
+    # Column widths from one pass over each column
+    widths = [
+        max(len(h), max(map(len, column))) for h, column in zip(MARKDOWN_HEADERS, zip(*rows))
     ]
 
-    return f"""|{header}|
-|{sep}|
-""" + "\n".join(f"|{row}|" for row in table_rows)
+    # Format table from a row template built once for these widths
+    row_format = "| " + " | ".join("{:<%d}" % w for w in widths) + " |"
+    yield row_format.format(*MARKDOWN_HEADERS)
+    yield "|" + "|".join("-" * (w + 2) for w in widths) + "|"
+    for row in rows:
+        yield row_format.format(*row)
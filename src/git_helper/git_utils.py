@@ -1,151 +1,353 @@
 """Git utility functions."""
 
+import atexit
 import logging
 import os
-import re
+import stat
 import subprocess
-from functools import cache
-from typing import Dict, List
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 import click
 import git
 from git.cmd import Git
 from rich.console import Console
 
-from .models import FileChange
+from .models import FileChange, RepoInfo
 
 console = Console()
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
+# Size of the reads used to stream blob contents from git
+READ_CHUNK_SIZE = 64 * 1024
 
-def get_repo_root() -> str:
-    """Find git repository root."""
+# Index of the path field in each kind of `git status --porcelain=v2` record:
+# ordinary changes, renames or copies, and unmerged paths
+STATUS_PATH_FIELD = {"1": 8, "2": 9, "u": 10}
+
+
+class GitBatchClient:
+    """Read-only git queries for one repository over long-lived git processes.
+
+    Blob reads share one persistent `git cat-file --batch` process, taking turns
+    under a lock, so repeated lookups (e.g. during a review session) do not
+    respawn git whichever thread they come from. The process is closed when the
+    interpreter exits.
+
+    Every query runs with GIT_OPTIONAL_LOCKS=0, so e.g. `git status` does not
+    take index.lock to write back its refreshed stat cache and cannot collide
+    with a concurrent git command, and with GIT_TERMINAL_PROMPT=0 so git fails
+    rather than waiting on a credential prompt.
+    """
+
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+        self.env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
+        self.git = Git(repo_path)
+        self.git.update_environment(GIT_OPTIONAL_LOCKS="0", GIT_TERMINAL_PROMPT="0")
+        self._cat_file_process: Optional[subprocess.Popen] = None
+        # Guards the cat-file process, whose requests and replies must not interleave
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _cat_file(self) -> subprocess.Popen:
+        """Get the `git cat-file --batch` process, starting it if needed; hold the lock."""
+        if self._cat_file_process is None:
+            self._cat_file_process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                cwd=self.repo_path,
+                env=self.env,
+            )
+        return self._cat_file_process
+
+    def _request_blob(self, rev_path: str) -> Optional[int]:
+        """Ask for a blob and return its size, or None if it is not a blob; hold the lock."""
+        process = self._cat_file()
+        process.stdin.write(f"{rev_path}\n".encode())
+        process.stdin.flush()
+
+        # Header is "<sha> <type> <size>\n", or "<rev_path> missing\n"
+        header = process.stdout.readline()
+        if header.endswith(b" missing\n"):
+            return None
+        _, object_type, size = header.split()
+        if object_type != b"blob":
+            # Skip the contents (and trailing LF) to keep the stream in sync
+            process.stdout.read(int(size) + 1)
+            return None
+        return int(size)
+
+    def blob_line_count(self, rev_path: str) -> int:
+        """Count the lines of a blob without holding it in memory, or 0 if it does not exist."""
+        line_count = 0
+        chunk = b""
+        with self._lock:
+            size = self._request_blob(rev_path)
+            if size is None:
+                return 0
+            stdout = self._cat_file().stdout
+            while size:
+                chunk = stdout.read(min(size, READ_CHUNK_SIZE))
+                if not chunk:
+                    break
+                line_count += chunk.count(b"\n")
+                size -= len(chunk)
+            stdout.read(1)  # trailing LF
+        # A final line without a trailing newline still counts
+        if chunk and not chunk.endswith(b"\n"):
+            line_count += 1
+        return line_count
+
+    def _iter_records(self, *args: str) -> Iterator[str]:
+        """Run a git command with `-z` output and yield its records as git writes them."""
+        # stderr goes to a file, since a pipe left unread while stdout streams could fill up
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                ["git", *args],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                cwd=self.repo_path,
+                env=self.env,
+            )
+            with process:
+                pending = b""
+                # read1 returns whatever git has written so far instead of waiting for a full chunk
+                while chunk := process.stdout.read1(READ_CHUNK_SIZE):
+                    *records, pending = (pending + chunk).split(b"\0")
+                    for record in records:
+                        yield record.decode("utf-8", "replace")
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", "replace")
+        if process.returncode:
+            raise git.exc.GitCommandError(["git", *args], process.returncode, stderr)
+
+    def numstat_records(self, cached: bool = False) -> Iterator[str]:
+        """Stream `git diff --numstat -z` against HEAD, or for the index alone if cached."""
+        return self._iter_records("diff", "--numstat", "-z", "--staged" if cached else "HEAD")
+
+    def status_porcelain(self) -> str:
+        """Get `git status --porcelain=v2 -z`, whose records are NUL-terminated."""
+        # Untracked directories stay collapsed even if status.showUntrackedFiles=all is set
+        return self.git.status("--porcelain=v2", "-z", "--untracked-files=normal")
+
+    def close(self) -> None:
+        """Stop the persistent git process."""
+        with self._lock:
+            process, self._cat_file_process = self._cat_file_process, None
+        if process is not None:
+            process.stdin.close()
+            process.wait()
+
+
+@lru_cache(maxsize=None)
+def get_batch_client(repo_path: str) -> GitBatchClient:
+    """Get the shared GitBatchClient for a repository."""
+    return GitBatchClient(repo_path)
+
+
+@lru_cache(maxsize=1)
+def get_repo() -> git.Repo:
+    """Open the repository containing the working directory, once per process."""
     try:
-        repo = git.Repo(search_parent_directories=True)
-        return repo.working_tree_dir
+        return git.Repo(search_parent_directories=True)
     except git.exc.InvalidGitRepositoryError:
         console.print("[red]Error:[/red] Not in a git repository")
         raise click.Abort()
 
 
-@cache
+def get_repo_info() -> RepoInfo:
+    """Find the git repository root with a single git call."""
+    try:
+        return RepoInfo(Git().rev_parse("--show-toplevel"))
+    except git.exc.GitCommandError:
+        console.print("[red]Error:[/red] Not in a git repository")
+        raise click.Abort()
+
+
+def _parse_numstat(records: Iterator[str]) -> Tuple[Dict[str, Tuple[int, int]], Set[str]]:
+    """Parse `git diff --numstat -z` records into per-file (added, removed) and binary files."""
+    stats_dict = {}
+    binary_files = set()
+    records = iter(records)
+    for record in records:
+        added, removed, file = record.split("\t", 2)
+        if not file:
+            # A rename has an empty path, then records with the old and the new path
+            next(records)
+            file = next(records)
+        if added == "-":
+            # Binary files have no line counts
+            binary_files.add(file)
+            added = removed = 0
+        stats_dict[file] = (int(added), int(removed))
+    return stats_dict, binary_files
+
+
 def get_file_changes(repo_path: str, cached_only: bool = False) -> List[FileChange]:
-    """Get list of changed files with detailed statistics."""
-    git = Git(repo_path)
+    """Get list of changed files with detailed statistics.
+
+    Not cached: each call reflects the current repository state, so callers
+    that need the list more than once should pass it along.
+    """
+    client = get_batch_client(repo_path)
     changes = []
-    stats_dict_unstaged: Dict = {}
-    stats_dict_staged: Dict = {}
-
-    # Get diff stats for all modified, unstaged files at once
-    if not cached_only:
-        # diff_stats, _, _ = run_git_command(["diff", "--numstat"], repo_path)
-        diff_stats = git.diff("--numstat")
-        for line in diff_stats.split("\n"):
-            if line:
-                added, removed, file = line.split("\t")
-                stats_dict_unstaged[file] = (int(added), int(removed))
-
-    # Get diff stats for all modified, staged files at once
-    diff_stats = git.diff("--numstat", "--staged")
-    for line in diff_stats.split("\n"):
-        if line:
-            added, removed, file = line.split("\t")
-            old_file = ""
-            if " => " in file:
-                # Parse renamed files
-                rename_regex = r"^(.+)\{(.+) => (.+)\}(.*)$"
-                match = re.match(rename_regex, file)
-                if match:
-                    old_file = match.group(1) + match.group(2) + match.group(4)
-                    new_file = match.group(1) + match.group(3) + match.group(4)
-                    file = new_file
-            stats_dict_staged[file] = (int(added), int(removed), old_file)
+    rows = []
+    working_files: List[str] = []
+    deleted_files: List[str] = []
+
+    # The status and numstat queries are independent, so run git status alongside
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        status_output = executor.submit(client.status_porcelain)
+
+        # Get diff stats for the index and working tree against HEAD in one git process
+        try:
+            stats_dict, binary_files = _parse_numstat(client.numstat_records(cached_only))
+        except git.exc.GitCommandError:
+            # HEAD does not resolve until the first commit, so everything is in the index
+            stats_dict, binary_files = _parse_numstat(client.numstat_records(cached=True))
+
+        status_output = status_output.result()
 
     # Get status of files
-    status_output = git.status("--porcelain")
-    for line in status_output.split("\n"):
-        if not line:
+    # Paths are unquoted; a rename record is followed by a record with the old path
+    records = iter(status_output.split("\0"))
+    for record in records:
+        kind = record[:1]
+        if kind == "?":
+            status, file = "??", record[2:]
+        elif kind in STATUS_PATH_FIELD:
+            fields = record.split(" ", STATUS_PATH_FIELD[kind])
+            # Unchanged sides are "." in v2 but " " in the short format shown to users
+            status, file = fields[1].replace(".", " "), fields[-1]
+        else:
+            # Ignored files, or the trailing empty record
             continue
 
-        status = line[:2]
-        file = line[2:].strip().strip('"')
-
         # Skip .git directory and pending-changes.md
         if file.startswith(".git/") or file == "pending-changes.md":
-            logger.info(f"Skipping {file}")
+            logger.info("Skipping %s", file)
             continue
 
-        # Get diff statistics from the pre-computed stats
-        added_lines = 0
-        removed_lines = 0
-        status2 = ""
         description = ""
+        if kind == "2":
+            description = f"<<{next(records)}>>"
 
-        if file in stats_dict_unstaged:
-            added_lines, removed_lines = stats_dict_unstaged[file]
+        # Get diff statistics from the pre-computed stats
+        added_lines, removed_lines = stats_dict.get(file, (0, 0))
+
+        # Porcelain status is "XY": X for the index, Y for the working tree
+        status2 = ""
+        if not cached_only and status[1] not in " ?":
             status2 = "W"  # working copy
-        if file in stats_dict_staged:
-            added_lines += stats_dict_staged[file][0]
-            removed_lines += stats_dict_staged[file][1]
+        if status[0] not in " ?":
             status2 += "S"  # staging
 
-        if " -> " in file:
-            old_file, file = file.split(" -> ")
-            description = f"<<{old_file}>>"
-
-        change = FileChange(
-            file, status2, status, added_lines, removed_lines, 100.0, description
+        percent_changed = 100.0
+        if file in binary_files:
+            # Skip reading binary contents; their percentage cannot be computed
+            description = description or "Binary file"
+        elif not (added_lines or removed_lines or "D" in status or "?" in status or "A" in status):
+            # Nothing changed line-wise (e.g. a mode change), so skip reading the file
+            percent_changed = 0
+        elif file in stats_dict and ("A" in status or "D" in status):
+            # Numstat against HEAD already counts every line of an added file as added,
+            # and every line of a deleted one as removed
+            pass
+        elif "D" in status:
+            # Deleted files are gone from the working tree, so count them as of HEAD
+            deleted_files.append(file)
+        else:
+            working_files.append(file)
+        rows.append(
+            (file, status2, status, added_lines, removed_lines, percent_changed, description)
         )
 
-        # Calculate percentage changed
-        total_lines = get_line_count(file, repo_path)
-
-        # Get diff statistics
-        if "D" in status:
-            # For deleted files, count all lines as removed
-            change.removed_lines = total_lines
-        elif "?" in status or "A" in status:
-            # For untracked/added files, count all lines as added
-            change.added_lines = total_lines
-
-        change.percent_changed = (
-            round(max(change.added_lines, change.removed_lines) / total_lines * 100, 2)
-            if total_lines > 0
-            else 100
-        )
+    # Count working-tree lines on a thread pool (file reads release the GIL) while
+    # this thread reads deleted files from HEAD over the shared cat-file process
+    line_counts = {}
+    with ThreadPoolExecutor(max_workers=min(32, len(working_files) or 1)) as executor:
+        working_counts = executor.map(get_line_count, working_files, repeat(repo_path))
+        for file in deleted_files:
+            line_counts[file] = get_head_line_count(file, repo_path)
+        line_counts.update(zip(working_files, working_counts))
 
-        changes.append(change)
+    for file, status2, status, added_lines, removed_lines, percent_changed, description in rows:
+        if file in line_counts:
+            total_lines = line_counts[file]
+            if "D" in status:
+                # For deleted files, count all lines as removed
+                removed_lines = total_lines
+            elif "?" in status or "A" in status:
+                # For untracked/added files, count all lines as added
+                added_lines = total_lines
 
-    return changes
+            # Calculate percentage changed
+            percent_changed = (
+                round(max(added_lines, removed_lines) / total_lines * 100, 2)
+                if total_lines > 0
+                else 100
+            )
 
+        changes.append(
+            FileChange(
+                file,
+                status2,
+                status,
+                added_lines,
+                removed_lines,
+                percent_changed,
+                description,
+            )
+        )
 
-def get_diff_output(repo_path: str, file: str) -> str:
-    """Get git diff for changed file."""
-    diff_cmd = ["git", "diff", "--no-color", "HEAD", file]
-    result = subprocess.run(diff_cmd, capture_output=True, text=True)
-    result = Git(repo_path).diff("--no-color", "HEAD", file)
-    return result
+    return changes
 
 
 def get_line_count(file, path):
     file_path = os.path.join(path, file)
-    if not os.path.exists(file_path):
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
         return 0
-    if os.path.isdir(file_path):
+    if not stat.S_ISREG(file_stat.st_mode):
         return 0
-    with open(file_path, "r", encoding="utf-8") as f:
-        return len(f.readlines())
+    return _count_lines(file_path, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+@lru_cache(maxsize=4096)
+def _count_lines(file_path: str, mtime_ns: int, size: int) -> int:
+    """Count the lines of a file; mtime and size key the cache so edits are re-read."""
+    lines = 0
+    last = b"\n"
+    # Unbuffered: the chunked reads need no BufferedReader in between
+    with open(file_path, "rb", buffering=0) as f:
+        while chunk := f.read(READ_CHUNK_SIZE):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    # Count like readlines(): a final line without a trailing newline still counts
+    return lines + (0 if last == b"\n" else 1)
+
+
+def get_head_line_count(file, path):
+    """Count the lines of a file as of HEAD."""
+    return get_batch_client(path).blob_line_count(f"HEAD:{file}")
 
 
 def get_file_diff(change: FileChange, unified: int = 3) -> str:
     """Get the diff content for a file."""
-    repo = git.Repo(get_repo_root())
+    repo = get_repo()
 
     try:
         # Get the diff for the file
-        diff = repo.git.diff(f"--unified={unified}", "--no-color", "HEAD", change.file, color=True)
+        diff = repo.git.diff(f"--unified={unified}", "--no-color", "HEAD", change.file)
         return diff
     except git.exc.GitCommandError:
         # For new files, show the entire content
@@ -156,3 +358,73 @@ def get_file_diff(change: FileChange, unified: int = 3) -> str:
                 f"+{line}" for line in content.splitlines()
             )
         return ""
+
+
+# Single-character escapes in the C-quoted paths git writes; other bytes are
+# written as a backslash and three octal digits
+_QUOTED_PATH_ESCAPES = dict(zip('abtnvfr"\\', '\a\b\t\n\v\f\r"\\'))
+
+
+def _read_quoted_path(text: str, start: int) -> Tuple[str, int]:
+    """Decode the C-quoted path opening at text[start]; also return the index past it."""
+    path = bytearray()
+    i = start + 1
+    while text[i] != '"':
+        if text[i] != "\\":
+            path += text[i].encode()
+            i += 1
+        elif text[i + 1] in "01234567":
+            # Non-ASCII paths are quoted byte by byte unless core.quotePath is off
+            path.append(int(text[i + 1 : i + 4], 8))
+            i += 4
+        else:
+            path += _QUOTED_PATH_ESCAPES[text[i + 1]].encode()
+            i += 2
+    return path.decode("utf-8", "replace"), i + 1
+
+
+def _diff_section_path(section: str) -> str:
+    """Get the new path of a `diff --git` section, whose header is "a/<old> b/<new>"."""
+    header = section.split("\n", 1)[0]
+    if not header.endswith('"'):
+        # Unless the file was renamed both paths are the same, which also holds when a
+        # path itself contains " b/"
+        file = header[len(header) // 2 + 3 :]
+        if header == f"a/{file} b/{file}":
+            return file
+    # A rename or copy names its new path unambiguously in the extended header
+    for marker in ("\nrename to ", "\ncopy to "):
+        start = section.find(marker)
+        if start != -1:
+            start += len(marker)
+            end = section.find("\n", start)
+            file = section[start : end if end != -1 else None]
+            return _read_quoted_path(file, 0)[0] if file.startswith('"') else file
+    if header.endswith('"'):
+        # git quotes paths with special characters
+        start = _read_quoted_path(header, 0)[1] + 1 if header.startswith('"') else 0
+        return _read_quoted_path(header, header.index('"b/', start))[0][2:]
+    return header.rsplit(" b/", 1)[-1]
+
+
+def split_diff_by_file(diff: str) -> Dict[str, str]:
+    """Split combined `git diff` output into per-file sections keyed by path."""
+    file_diffs = {}
+    for section in ("\n" + diff).split("\ndiff --git ")[1:]:
+        file_diffs[_diff_section_path(section)] = "diff --git " + section
+    return file_diffs
+
+
+def get_file_diffs(files: List[str], unified: int = 3) -> Dict[str, str]:
+    """Get the diffs of several files from one git process, keyed by path.
+
+    Files git has no diff for (e.g. untracked ones) are missing from the result.
+    """
+    if not files:
+        # An empty pathspec would diff the whole tree
+        return {}
+    # Keep non-ASCII paths readable; split_diff_by_file unquotes whatever git still quotes
+    diff = get_repo().git(c="core.quotePath=false").diff(
+        f"--unified={unified}", "--no-color", "HEAD", "--", *files
+    )
+    return split_diff_by_file(diff)
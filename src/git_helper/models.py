@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FileChange:
     file: str
     status2: str
@@ -14,9 +14,16 @@ class FileChange:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DiffHunk:
     """Represents a single change hunk in a diff."""
 
     start_line: int
     content: str
+
+
+@dataclass(slots=True, frozen=True)
+class RepoInfo:
+    """Repository metadata resolved once per CLI invocation."""
+
+    root: str
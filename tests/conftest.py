@@ -0,0 +1,25 @@
+"""Shared test fixtures."""
+import subprocess
+
+import pytest
+
+from git_helper import git_utils
+
+
+@pytest.fixture(autouse=True)
+def clear_git_caches():
+    """Drop cached repository objects so each test sees its own mocks."""
+    git_utils.get_repo.cache_clear()
+    yield
+    git_utils.get_repo.cache_clear()
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    """Create an empty repository and run the test from its working tree."""
+    for name in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{name}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{name}_EMAIL", "test@example.com")
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
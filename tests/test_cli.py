@@ -0,0 +1,19 @@
+"""Tests for the command line interface."""
+from click.testing import CliRunner
+
+from git_helper.cli import cli
+
+
+def test_commands_without_repository_work_outside_one(tmp_path, monkeypatch):
+    """Only commands that touch the repository need one."""
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    assert runner.invoke(cli, ["review", "--help"]).exit_code == 0
+    result = runner.invoke(cli, ["message"])
+    assert result.exit_code == 0
+    assert "AI assistant" in result.output
+
+    result = runner.invoke(cli, ["commit", "feat: x"])
+    assert result.exit_code != 0
+    assert "Not in a git repository" in result.output
@@ -0,0 +1,90 @@
+"""Tests for conventional commit parsing and validation."""
+import pytest
+
+from git_helper.commit_validator import (
+    CommitValidator,
+    format_validation_error,
+    get_commit_type,
+    validate_commit_message,
+)
+
+
+def test_parse_header_only():
+    """A single-line message has no body or footers."""
+    commit = CommitValidator.parse_commit_message("feat(cli): add review command")
+    assert commit.type == "feat"
+    assert commit.scope == "cli"
+    assert commit.description == "add review command"
+    assert commit.body is None
+    assert commit.footers == ()
+    assert not commit.breaking
+
+
+def test_parse_body_and_footers():
+    """Paragraphs after the description form the body; a final footer paragraph is split off."""
+    message = (
+        "fix!: handle quoted paths\n"
+        "\n"
+        "First paragraph\nstill first.\n"
+        "\n"
+        "Second paragraph.\n"
+        "\n"
+        "Refs #12\n"
+        "BREAKING CHANGE: paths are unquoted"
+    )
+    commit = CommitValidator.parse_commit_message(message)
+    assert commit.breaking
+    assert commit.description == "handle quoted paths"
+    assert commit.body == "First paragraph\nstill first.\n\nSecond paragraph."
+    assert commit.footers == ("Refs #12", "BREAKING CHANGE: paths are unquoted")
+
+
+def test_parse_final_paragraph_not_footers():
+    """A final paragraph with any non-footer line stays in the body."""
+    commit = CommitValidator.parse_commit_message("docs: update\n\nRefs #12\nplain text")
+    assert commit.body == "Refs #12\nplain text"
+    assert commit.footers == ()
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["feat: add thing", "fix(auth): resolve login issue", "chore!: drop py3.8\n\nBody."],
+)
+def test_validate_valid(message):
+    assert validate_commit_message(message) == (True, None)
+
+
+@pytest.mark.parametrize(
+    "message, commit_type",
+    [("feature: add thing", "feature"), ("wip(cli): x", "wip"), ("hack!: y", "hack")],
+)
+def test_validate_invalid_type(message, commit_type):
+    """Unknown types are rejected and name the allowed ones."""
+    is_valid, error = validate_commit_message(message)
+    assert not is_valid
+    assert error == (
+        f"Invalid type '{commit_type}'. Allowed types are: "
+        "build, chore, ci, docs, feat, fix, perf, refactor, revert, style, test"
+    )
+    assert format_validation_error(error).startswith("Type must be one of:")
+
+
+@pytest.mark.parametrize(
+    "message, error",
+    [
+        ("", "Commit message cannot be empty"),
+        ("no colon here", "Invalid commit message format"),
+        ("feat:missing space", "Invalid commit message format"),
+        ("feat: ", "Commit message must include a description"),
+        ("Feat: add thing", "Invalid commit message format"),
+    ],
+)
+def test_validate_invalid_format(message, error):
+    is_valid, message_error = validate_commit_message(message)
+    assert not is_valid
+    assert message_error.startswith(error)
+
+
+def test_get_commit_type():
+    assert get_commit_type("refactor(git): split helpers") == "refactor"
+    assert get_commit_type("not conventional") is None
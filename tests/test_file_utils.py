@@ -0,0 +1,59 @@
+"""Tests for writing pending-changes.md in file_utils."""
+import subprocess
+
+import pytest
+
+from git_helper.file_utils import _truncate_diff, get_pending_file_path, update_pending_changes
+from git_helper.git_utils import FileChange
+
+
+def _change(file):
+    return FileChange(
+        file=file,
+        status2="W",
+        status=" M",
+        added_lines=1,
+        removed_lines=0,
+        percent_changed=50.0,
+    )
+
+
+def test_update_pending_changes_quoted_and_spaced_paths(git_repo):
+    """Paths git quotes in diff headers, or that contain spaces, keep their diffs."""
+    files = ["héllo.txt", "with space.txt", 'tab\t"q".txt']
+    for file in files:
+        (git_repo / file).write_text("old\n", encoding="utf-8")
+    subprocess.run(["git", "add", "-A"], cwd=git_repo, check=True)
+    subprocess.run(["git", "commit", "-qm", "init"], cwd=git_repo, check=True)
+    for file in files:
+        (git_repo / file).write_text("old\nnew\n", encoding="utf-8")
+
+    update_pending_changes(str(git_repo), [_change(file) for file in files])
+
+    with open(get_pending_file_path(str(git_repo)), encoding="utf-8") as f:
+        sections = f.read().split("\n### ")[1:]
+    assert len(sections) == len(files)
+    for file, section in zip(files, sections):
+        assert section.startswith(f"{file}\n```diff\ndiff --git ")
+        assert "\n+new\n" in section
+
+
+@pytest.mark.parametrize(
+    "line_count, expected",
+    [
+        (2, "1\n2"),
+        (3, "1\n2\n3"),
+        (4, "1\n2\n3\n... (1 more lines elided)"),
+        (6, "1\n2\n3\n... (3 more lines elided)"),
+    ],
+)
+def test_truncate_diff(line_count, expected):
+    """Diffs up to max_lines lines are kept whole; longer ones note the elided lines."""
+    diff = "\n".join(str(n) for n in range(1, line_count + 1))
+    assert _truncate_diff(diff, 3) == expected
+
+
+def test_truncate_diff_without_limit():
+    """No limit keeps the whole diff."""
+    diff = "\n".join(str(n) for n in range(1000))
+    assert _truncate_diff(diff, None) is diff
@@ -0,0 +1,31 @@
+"""Tests for the persistent git processes in git_utils."""
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from git_helper.git_utils import GitBatchClient
+
+
+def test_blob_reads_share_one_process(git_repo):
+    """Threads take turns on a single cat-file process and each gets its own blob."""
+    files = [f"f{n}.txt" for n in range(20)]
+    for n, file in enumerate(files):
+        (git_repo / file).write_text("line\n" * n + "last")
+    subprocess.run(["git", "add", "-A"], cwd=git_repo, check=True)
+    subprocess.run(["git", "commit", "-qm", "init"], cwd=git_repo, check=True)
+
+    client = GitBatchClient(str(git_repo))
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            counts = list(executor.map(lambda f: client.blob_line_count(f"HEAD:{f}"), files))
+        process = client._cat_file_process
+        # A fresh thread reuses the same process
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            count = executor.submit(client.blob_line_count, "HEAD:f2.txt").result()
+        assert client._cat_file_process is process
+    finally:
+        client.close()
+
+    assert counts == list(range(1, 21))
+    assert count == 3
+    assert client.blob_line_count("HEAD:missing.txt") == 0
+    client.close()
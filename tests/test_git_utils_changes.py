@@ -0,0 +1,79 @@
+"""Tests for parsing git status and numstat output in git_utils."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from git_helper.git_utils import FileChange, _parse_numstat, get_file_changes
+
+MODES = "N... 100644 100644 100644 1111111 2222222"
+
+# `git status --porcelain=v2 -z` output: ordinary, spaced, binary, renamed, untracked
+# and deleted
+STATUS_OUTPUT = "\0".join(
+    [
+        f"1 .M {MODES} x.txt",
+        f"1 .M {MODES} with space.txt",
+        f"1 M. {MODES} bin.dat",
+        f"2 R. {MODES} R100 new name.txt",
+        "old name.txt",
+        "? untracked.txt",
+        f"1 .D {MODES} gone.txt",
+        "",
+    ]
+)
+
+# `git diff --numstat -z HEAD` records; a rename has an empty path then both paths
+NUMSTAT_RECORDS = [
+    "2\t1\tx.txt",
+    "1\t0\twith space.txt",
+    "-\t-\tbin.dat",
+    "1\t1\t",
+    "old name.txt",
+    "new name.txt",
+    "0\t7\tgone.txt",
+]
+
+
+def test_parse_numstat():
+    """Numstat records give line counts per path, with binary files set apart."""
+    stats, binary_files = _parse_numstat(NUMSTAT_RECORDS + ["1\t0\ttab\tname.txt"])
+    assert stats == {
+        "x.txt": (2, 1),
+        "with space.txt": (1, 0),
+        "bin.dat": (0, 0),
+        "new name.txt": (1, 1),
+        "gone.txt": (0, 7),
+        "tab\tname.txt": (1, 0),
+    }
+    assert binary_files == {"bin.dat"}
+
+
+@pytest.fixture
+def batch_client():
+    """Patch the git batch client to serve the canned output."""
+    client = MagicMock()
+    client.status_porcelain.return_value = STATUS_OUTPUT
+    client.numstat_records.side_effect = lambda cached=False: iter(NUMSTAT_RECORDS)
+    with patch("git_helper.git_utils.get_batch_client", return_value=client):
+        yield client
+
+
+def test_get_file_changes(batch_client, tmp_path):
+    """Status records are joined with numstat and working-tree line counts."""
+    for file, lines in [("x.txt", 4), ("with space.txt", 2), ("new name.txt", 2)]:
+        (tmp_path / file).write_text("line\n" * lines)
+    (tmp_path / "untracked.txt").write_text("a\nb\nc")
+
+    changes = get_file_changes(str(tmp_path))
+
+    assert changes == [
+        FileChange("x.txt", "W", " M", 2, 1, 50.0),
+        FileChange("with space.txt", "W", " M", 1, 0, 50.0),
+        FileChange("bin.dat", "S", "M ", 0, 0, 100.0, "Binary file"),
+        FileChange("new name.txt", "S", "R ", 1, 1, 50.0, "<<old name.txt>>"),
+        FileChange("untracked.txt", "", "??", 3, 0, 100.0),
+        FileChange("gone.txt", "W", " D", 0, 7, 100.0),
+    ]
+    batch_client.numstat_records.assert_called_once_with(False)
+    # Deleted files take their line count from numstat rather than reading HEAD
+    batch_client.blob_line_count.assert_not_called()
@@ -1,11 +1,12 @@
 """Tests for git diff functionality in git_utils."""
 import os
+import subprocess
 from unittest.mock import MagicMock, patch
 
 import git
 import pytest
 
-from git_helper.git_utils import FileChange, get_file_diff
+from git_helper.git_utils import FileChange, get_file_diff, get_file_diffs, split_diff_by_file
 
 @pytest.fixture
 def sample_change():
@@ -28,7 +29,7 @@ def test_get_file_diff_modified(mock_repo, sample_change):
     
     diff = get_file_diff(sample_change)
     assert diff == "sample diff output"
-    mock_git.diff.assert_called_once_with('HEAD', sample_change.file, color=True)
+    mock_git.diff.assert_called_once_with('--unified=3', '--no-color', 'HEAD', sample_change.file)
 
 @patch('git_helper.git_utils.git.Repo')
 def test_get_file_diff_new_file(mock_repo, sample_change, tmp_path):
@@ -65,12 +66,73 @@ def test_get_file_diff_error_handling(mock_repo, sample_change):
         assert diff == ""
 
 @patch('git_helper.git_utils.git.Repo')
-def test_get_file_diff_with_color(mock_repo, sample_change):
-    """Test that diff is requested with color."""
+def test_get_file_diff_without_color(mock_repo, sample_change):
+    """Test that diff is requested without color, so no ANSI codes need stripping."""
     mock_git = MagicMock()
-    mock_git.diff.return_value = "\x1b[32m+new line\x1b[0m"
+    mock_git.diff.return_value = "+new line"
     mock_repo.return_value.git = mock_git
     
-    diff = get_file_diff(sample_change)
-    assert diff == "\x1b[32m+new line\x1b[0m"
-    mock_git.diff.assert_called_once_with('HEAD', sample_change.file, color=True)
+    diff = get_file_diff(sample_change, unified=10000)
+    assert diff == "+new line"
+    mock_git.diff.assert_called_once_with('--unified=10000', '--no-color', 'HEAD', sample_change.file)
+
+
+def test_get_file_diffs_quoted_paths(git_repo):
+    """Diffs of paths git would quote are keyed by the plain path."""
+    files = ["héllo.txt", 'tab\t"q".txt', "with space.txt"]
+    for file in files:
+        (git_repo / file).write_text("old\n", encoding="utf-8")
+    subprocess.run(["git", "add", "-A"], cwd=git_repo, check=True)
+    subprocess.run(["git", "commit", "-qm", "init"], cwd=git_repo, check=True)
+    for file in files:
+        (git_repo / file).write_text("new\n", encoding="utf-8")
+
+    diffs = get_file_diffs(files)
+    assert sorted(diffs) == sorted(files)
+    assert all("\n-old\n+new" in diff for diff in diffs.values())
+
+
+@pytest.mark.parametrize(
+    "header, path",
+    [
+        ("a/test.py b/test.py", "test.py"),
+        ("a/x b/y.py b/x b/y.py", "x b/y.py"),
+        ("a/old.py b/new.py\nrename from old.py\nrename to new.py", "new.py"),
+        (
+            "a/old b/x.py b/new b/x.py\nrename from old b/x.py\nrename to new b/x.py",
+            "new b/x.py",
+        ),
+        ("a/old.py b/new.py", "new.py"),
+        ('"a/h\\303\\251llo.py" "b/h\\303\\251llo.py"', "héllo.py"),
+        ('"a/tab\\t\\"q\\".py" "b/tab\\t\\"q\\".py"', 'tab\t"q".py'),
+        (
+            'a/old.py "b/n\\303\\253w.py"\nrename from old.py\nrename to "n\\303\\253w.py"',
+            "nëw.py",
+        ),
+        ('a/old.py "b/n\\303\\253w.py"', "nëw.py"),
+        ('"a/\\303\\266ld.py" b/new.py', "new.py"),
+    ],
+)
+def test_split_diff_by_file_paths(header, path):
+    """Sections are keyed by the new path, unquoted, whatever the header holds."""
+    section = f"diff --git {header}\n--- a/x\n+++ b/x\n@@ -1 +1 @@\n-a\n+b"
+    diff = "diff --git a/first.py b/first.py\n+x\n" + section
+    file_diffs = split_diff_by_file(diff)
+    assert list(file_diffs) == ["first.py", path]
+    assert file_diffs[path] == section
+
+
+def test_split_diff_by_file_pure_rename():
+    """A rename with no content changes ends at its extended header."""
+    diff = (
+        "diff --git a/old b/x.py b/new b/x.py\nsimilarity index 100%\n"
+        "rename from old b/x.py\nrename to new b/x.py"
+    )
+    assert list(split_diff_by_file(diff)) == ["new b/x.py"]
+
+
+@patch('git_helper.git_utils.git.Repo')
+def test_get_file_diffs_no_files(mock_repo):
+    """No files means no git call, rather than a diff of the whole tree."""
+    assert get_file_diffs([]) == {}
+    mock_repo.assert_not_called()
@@ -0,0 +1,48 @@
+"""Tests for the standalone git-workflow.py script."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from git_helper import git_utils
+
+SCRIPT = Path(__file__).resolve().parent.parent / "git-workflow.py"
+
+
+@pytest.fixture(scope="module")
+def git_workflow():
+    """Load git-workflow.py as a module; its name is not importable."""
+    spec = importlib.util.spec_from_file_location("git_workflow", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+DIFFS = [
+    'diff --git a/x.txt b/x.txt\n+a\n',
+    'diff --git a/with space.txt b/with space.txt\n+a\n',
+    'diff --git a/x b/y.txt b/x b/y.txt\n+a\n',
+    'diff --git a/old.txt b/new.txt\nrename from old.txt\n',
+    'diff --git a/o b/1.txt b/n b/1.txt\nrename from o b/1.txt\nrename to n b/1.txt\n',
+    'diff --git "a/h\\303\\251llo.txt" "b/h\\303\\251llo.txt"\n+a\n',
+    'diff --git a/old.txt "b/n\\303\\253w.txt"\n+a\n',
+    'diff --git "a/tab\\t\\"q\\".txt" "b/tab\\t\\"q\\".txt"\n+a\n',
+]
+
+
+def test_split_diff_by_file_matches_package(git_workflow):
+    """The script's copy of split_diff_by_file agrees with the package's."""
+    diff = "".join(DIFFS)
+    file_diffs = git_workflow.split_diff_by_file(diff)
+    assert file_diffs == git_utils.split_diff_by_file(diff)
+    assert list(file_diffs) == [
+        "x.txt",
+        "with space.txt",
+        "x b/y.txt",
+        "new.txt",
+        "n b/1.txt",
+        "héllo.txt",
+        "nëw.txt",
+        'tab\t"q".txt',
+    ]
+    assert file_diffs["héllo.txt"] == DIFFS[5].rstrip("\n")